@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Interactive Mattermost DM shell shared by scrape.py --mode test and test.py
+"""
+def read_input_block():
+    """Read lines from stdin until two consecutive empty lines (or EOF).
+    
+    Returns:
+        List of raw lines without the terminating empty line
+    """
+    lines = []
+    while True:
+        try:
+            line = input()
+        except EOFError:
+            break
+        if line == "" and lines and lines[-1] == "":
+            lines.pop()
+            break
+        lines.append(line)
+    return lines
+
+def run_dm_shell(api_url, token, bot_id, *, send_dm_to_user, send_group_dm,
+                 send_dm_to_multiple_users, username_lookup=None):
+    """Run the interactive send-a-DM menu until the user quits.
+    
+    The Mattermost send helpers are passed in rather than imported, so the
+    shell always uses the caller's loaded scrape module (and its session
+    and caches), even when scrape.py runs as __main__.
+    
+    Args:
+        api_url: Mattermost API URL
+        token: Bot token
+        bot_id: Bot user ID
+        send_dm_to_user: scrape.send_dm_to_user
+        send_group_dm: scrape.send_group_dm
+        send_dm_to_multiple_users: scrape.send_dm_to_multiple_users
+        username_lookup: Optional callable ``(names, mattermost_config) -> usernames``;
+            enables the username lookup tool (option 4) when given
+    """
+    print("\n" + "=" * 60)
+    
+    while True:
+        print("\n📨 Mattermost Test Menu")
+        print("Options:")
+        print("  1. Send to one person")
+        print("  2. Send to multiple people (individual DMs)")
+        print("  3. Send to group DM (all people in same conversation)")
+        if username_lookup:
+            print("  4. Test username lookup")
+        print("  5. Quit")
+        
+        choice = input("Choose option (1/2/3/4/5): " if username_lookup else "Choose option (1/2/3/5): ").strip()
+        
+        if choice == '5' or choice.lower() in ['quit', 'exit', 'q']:
+            break
+        
+        if choice not in ['1', '2', '3', '4'] or (choice == '4' and not username_lookup):
+            print("Please choose 1, 2, 3, 4, or 5." if username_lookup else "Please choose 1, 2, 3, or 5.")
+            continue
+        
+        # Username lookup tool
+        if choice == '4':
+            print("\n" + "=" * 60)
+            print("🔍 Username Lookup Tool")
+            print("=" * 60)
+            print("Enter supervisor name(s) in format 'Lastname, Firstname'")
+            print("(one per line, press Enter twice when done):")
+            
+            names = [name.strip() for name in read_input_block() if name.strip()]
+            
+            if not names:
+                print("No names entered.")
+                continue
+            
+            print("\n" + "-" * 60)
+            print("📊 Username Lookup Results:")
+            print("-" * 60)
+            
+            mattermost_config = {
+                'api_url': api_url,
+                'token': token
+            }
+            
+            usernames = username_lookup(names, mattermost_config)
+            
+            print("\n✓ Generated username mapping:")
+            for i, name in enumerate(names):
+                if i < len(usernames):
+                    print(f"  {name} → @{usernames[i]}")
+            
+            print("-" * 60)
+            continue
+        
+        # Get target username(s)
+        if choice == '1':
+            target_username = input("Enter target username: ").strip()
+            if not target_username:
+                print("Please enter a valid username.")
+                continue
+            usernames = [target_username]
+        else:  # choice == '2' or '3'
+            if choice == '2':
+                print("Enter usernames for individual DMs (one per line, press Enter twice when done):")
+            else:  # choice == '3'
+                print("Enter usernames for group DM (one per line, press Enter twice when done):")
+            
+            usernames = [u.strip() for u in read_input_block() if u.strip()]
+            
+            if not usernames:
+                print("Please enter at least one username.")
+                continue
+            
+            if choice == '3' and len(usernames) < 2:
+                print("Group DMs require at least 2 participants.")
+                continue
+            
+            print(f"Target users: {', '.join(usernames)}")
+        
+        # Get message
+        print("\nEnter your message (press Enter twice to finish):")
+        # Drop trailing empty lines in one pass
+        message = "\n".join(read_input_block()).rstrip("\n")
+        
+        if not message.strip():
+            print("Message cannot be empty. Try again.")
+            continue
+        
+        # Show preview and confirm
+        print("\n" + "-" * 30)
+        print("MESSAGE PREVIEW:")
+        print("-" * 30)
+        print(message)
+        print("-" * 30)
+        
+        # Show confirmation
+        if choice == '1':
+            confirm_msg = f"\nSend this message to @{usernames[0]}? (y/n): "
+        elif choice == '2':
+            confirm_msg = f"\nSend individual DMs to {len(usernames)} users ({', '.join(usernames)})? (y/n): "
+        else:  # choice == '3'
+            confirm_msg = f"\nSend this message to group DM with {len(usernames)} users ({', '.join(usernames)})? (y/n): "
+        
+        confirm = input(confirm_msg).strip().lower()
+        
+        if confirm in ['y', 'yes']:
+            print("\n" + "=" * 60)
+            
+            if choice == '1':
+                success = send_dm_to_user(api_url, token, bot_id, usernames[0], message)
+                if success:
+                    print(f"✅ Message delivered to @{usernames[0]}!")
+                else:
+                    print(f"❌ Failed to deliver message to @{usernames[0]}")
+            elif choice == '2':
+                results = send_dm_to_multiple_users(api_url, token, bot_id, usernames, message)
+                successful_count = sum(1 for success in results.values() if success)
+                print(f"\n🎯 Individual DMs complete: {successful_count}/{len(usernames)} successful")
+            else:  # choice == '3'
+                success = send_group_dm(api_url, token, bot_id, usernames, message)
+                if success:
+                    print(f"✅ Group DM message sent to {len(usernames)} participants!")
+                else:
+                    print(f"❌ Failed to send group DM message")
+        else:
+            print("Message cancelled.")
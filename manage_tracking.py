@@ -2,36 +2,16 @@
 """
 Utility script to manage processed submissions tracking
 """
-import json
-import os
-import sys
-from datetime import datetime
+from collections import Counter
+from operator import itemgetter
 
-def load_tracking_data():
-    """Load the tracking data file."""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    tracking_file = os.path.join(script_dir, 'processed_submissions.json')
-    
-    if not os.path.exists(tracking_file):
-        return {"processed": []}
-    
-    try:
-        with open(tracking_file, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return {"processed": []}
+from tracking import (
+    load_processed_submissions as load_tracking_data,
+    save_processed_submissions as save_tracking_data,
+)
 
-def save_tracking_data(data):
-    """Save the tracking data file."""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    tracking_file = os.path.join(script_dir, 'processed_submissions.json')
-    
-    with open(tracking_file, 'w') as f:
-        json.dump(data, f, indent=2)
-
-def list_processed():
+def list_processed(data):
     """List all processed submissions."""
-    data = load_tracking_data()
     processed = data.get('processed', [])
     
     if not processed:
@@ -47,26 +27,35 @@ def list_processed():
         print(f"   Author: {entry.get('author')}")
         print(f"   Processed at: {entry.get('processed_at')}")
 
-def clear_all():
-    """Clear all processed submissions."""
+def clear_all(data):
+    """Clear all processed submissions.
+    
+    Returns:
+        True if `data` was modified and needs saving
+    """
     confirm = input("⚠️  Are you sure you want to clear ALL processed submissions? (yes/no): ").strip().lower()
     
     if confirm == 'yes':
-        save_tracking_data({"processed": []})
+        data['processed'] = []
         print("✓ All processed submissions cleared.")
-    else:
-        print("❌ Cancelled.")
+        return True
+    
+    print("❌ Cancelled.")
+    return False
 
-def remove_by_record_id():
-    """Remove a specific submission by record ID."""
-    data = load_tracking_data()
+def remove_by_record_id(data):
+    """Remove a specific submission by record ID.
+    
+    Returns:
+        True if `data` was modified and needs saving
+    """
     processed = data.get('processed', [])
     
     if not processed:
         print("No processed submissions to remove.")
-        return
+        return False
     
-    list_processed()
+    list_processed(data)
     
     record_id = input("\nEnter record ID to remove: ").strip()
     
@@ -74,14 +63,14 @@ def remove_by_record_id():
     data['processed'] = [e for e in processed if str(e.get('record_id')) != record_id]
     
     if len(data['processed']) < initial_count:
-        save_tracking_data(data)
         print(f"✓ Removed submission with record ID {record_id}")
-    else:
-        print(f"❌ No submission found with record ID {record_id}")
+        return True
+    
+    print(f"❌ No submission found with record ID {record_id}")
+    return False
 
-def stats():
+def stats(data):
     """Show statistics about processed submissions."""
-    data = load_tracking_data()
     processed = data.get('processed', [])
     
     if not processed:
@@ -94,11 +83,11 @@ def stats():
     print(f"Total processed submissions: {len(processed)}")
     
     # Group by date
-    by_date = {}
-    for entry in processed:
-        date = entry.get('processed_at', '').split()[0]
-        if date:
-            by_date[date] = by_date.get(date, 0) + 1
+    by_date = Counter(
+        entry['processed_at'].partition(' ')[0]
+        for entry in processed
+        if entry['processed_at']
+    )
     
     if by_date:
         print(f"\nProcessed by date:")
@@ -107,7 +96,8 @@ def stats():
     
     # Most recent
     if processed:
-        most_recent = max(processed, key=lambda x: x.get('processed_at', ''))
+        # The loader fills in a missing 'processed_at', so itemgetter is safe
+        most_recent = max(processed, key=itemgetter('processed_at'))
         print(f"\nMost recent:")
         print(f"  {most_recent.get('title')}")
         print(f"  Author: {most_recent.get('author')}")
@@ -115,6 +105,9 @@ def stats():
 
 def main():
     """Main menu."""
+    # Load once per session; only write back after a change
+    data = load_tracking_data()
+    
     while True:
         print("\n" + "=" * 80)
         print("ETaPprover - Processed Submissions Manager")
@@ -129,13 +122,15 @@ def main():
         choice = input("\nChoose option (1-5): ").strip()
         
         if choice == '1':
-            list_processed()
+            list_processed(data)
         elif choice == '2':
-            stats()
+            stats(data)
         elif choice == '3':
-            remove_by_record_id()
+            if remove_by_record_id(data):
+                save_tracking_data(data)
         elif choice == '4':
-            clear_all()
+            if clear_all(data):
+                save_tracking_data(data)
         elif choice == '5':
             print("Goodbye!")
             break
@@ -143,4 +138,20 @@ def main():
             print("Invalid choice. Please choose 1-5.")
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    import json
+    
+    parser = argparse.ArgumentParser(
+        description='ETaPprover - Processed submissions manager'
+    )
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Print the tracking file as indented JSON and exit'
+    )
+    args = parser.parse_args()
+    
+    if args.pretty:
+        print(json.dumps(load_tracking_data(), indent=2, ensure_ascii=False))
+    else:
+        main()
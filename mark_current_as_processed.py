@@ -14,148 +14,20 @@ This script will:
 4. NOT send any notifications
 """
 
-import requests
-from bs4 import BeautifulSoup
-import json
-import os
 import sys
 from datetime import datetime
 
-def load_credentials():
-    """Load credentials from JSON file."""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    config_path = os.path.join(script_dir, 'credentials.json')
-
-    if not os.path.exists(config_path):
-        print(f"✗ Credentials file not found at {config_path}")
-        sys.exit(1)
-
-    try:
-        with open(config_path, 'r') as file:
-            return json.load(file)
-    except json.JSONDecodeError:
-        print(f"✗ Invalid JSON in credentials file")
-        sys.exit(1)
-
-def load_tracking_data():
-    """Load the tracking data file."""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    tracking_file = os.path.join(script_dir, 'processed_submissions.json')
-    
-    if not os.path.exists(tracking_file):
-        return {"processed": []}
-    
-    try:
-        with open(tracking_file, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return {"processed": []}
-
-def save_tracking_data(data):
-    """Save the tracking data file."""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    tracking_file = os.path.join(script_dir, 'processed_submissions.json')
-    
-    with open(tracking_file, 'w') as f:
-        json.dump(data, f, indent=2)
-
-def login(login_url, email, password):
-    """Login to the repository system."""
-    session = requests.Session()
-
-    try:
-        login_page = session.get(login_url)
-        soup = BeautifulSoup(login_page.text, 'html.parser')
-
-        csrf_token = soup.find('input', {'id': 'csrf_token'})
-        if not csrf_token:
-            print("✗ CSRF token not found on login page.")
-            return None
-
-        login_data = {
-            'email': email,
-            'password': password,
-            'csrf_token': csrf_token['value'],
-            'next': '/deposit'
-        }
-
-        response = session.post(login_url, data=login_data)
-
-        if response.status_code != 200:
-            print("✗ Login failed.")
-            return None
-
-        soup_response = BeautifulSoup(response.text, 'html.parser')
-        if soup_response.find('a', href='/logout') or 'logout' in response.text.lower():
-            print("✓ Login successful.")
-            return session
-        else:
-            print("✗ Login failed.")
-            return None
-    except Exception as e:
-        print(f"✗ Login error: {e}")
-        return None
-
-def get_pending_submissions(session, api_url):
-    """Fetch pending thesis submissions from API."""
-    try:
-        headers = {'Accept': 'application/vnd.zenodo.v1+json'}
-        response = session.get(api_url, headers=headers)
-        response.raise_for_status()
-
-        data = response.json()
-
-        all_submissions = []
-        if isinstance(data, list):
-            all_submissions = data
-        elif isinstance(data, dict) and 'hits' in data:
-            all_submissions = data['hits'].get('hits', [])
-
-        pending_submissions = [
-            sub for sub in all_submissions 
-            if sub.get('approval_status') == 'pending'
-        ]
-
-        print(f"✓ Total submissions fetched: {len(all_submissions)}")
-        print(f"✓ Pending submissions: {len(pending_submissions)}")
-        return pending_submissions
-
-    except requests.exceptions.RequestException as e:
-        print(f"✗ Error fetching submissions: {e}")
-        return []
-    except json.JSONDecodeError as e:
-        print(f"✗ Error parsing JSON response: {e}")
-        return []
-
-def extract_submission_data(submission):
-    """Extract relevant data from submission JSON."""
-    metadata = submission.get('metadata', {})
-    
-    record_id = submission.get('id') or submission.get('recid')
-    title = metadata.get('title', 'N/A')
-    
-    # Get thesis type
-    resource_type = metadata.get('resource_type', {})
-    thesis_type = resource_type.get('title', 'N/A')
-    
-    # Get author (first creator)
-    creators = metadata.get('creators', [])
-    author = creators[0].get('name', 'N/A') if creators else 'N/A'
-    
-    return {
-        'record_id': record_id,
-        'title': title,
-        'thesis_type': thesis_type,
-        'author': author,
-        'approval_status': submission.get('approval_status', 'unknown')
-    }
-
-def is_already_processed(record_id, author, tracking_data):
-    """Check if a submission is already in the tracking file."""
-    for entry in tracking_data.get('processed', []):
-        if entry.get('record_id') == record_id and entry.get('author') == author:
-            return True
-    return False
+from scrape import (
+    load_credentials,
+    login,
+    get_pending_submissions,
+    extract_submission_data,
+)
+from tracking import (
+    load_processed_submissions as load_tracking_data,
+    save_processed_submissions as save_tracking_data,
+    processed_keys,
+)
 
 def main():
     """Main function."""
@@ -185,7 +57,7 @@ def main():
     api_url = f"{base_url}/api/deposit/depositions"
     
     # Login
-    session = login(login_url, creds['email'], creds['password'])
+    session = login(login_url, creds['email'], creds['password'], api_url)
     if not session:
         print("\n✗ Login failed, exiting")
         sys.exit(1)
@@ -200,11 +72,14 @@ def main():
     # Load tracking data
     tracking_data = load_tracking_data()
     
+    # Index already tracked submissions for O(1) lookups
+    seen = processed_keys(tracking_data)
+    
     print("\n" + "=" * 80)
     print("Processing submissions...")
     print("=" * 80)
     
-    added_count = 0
+    new_entries = []
     skipped_count = 0
     
     for i, submission in enumerate(submissions, 1):
@@ -216,7 +91,8 @@ def main():
         print(f"  Type: {data['thesis_type']}")
         
         # Check if already processed
-        if is_already_processed(data['record_id'], data['author'], tracking_data):
+        key = (data['record_id'], data['author'])
+        if key in seen:
             print(f"  ⏭  Already in tracking file - skipping")
             skipped_count += 1
             continue
@@ -229,15 +105,15 @@ def main():
             'processed_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
         
-        if 'processed' not in tracking_data:
-            tracking_data['processed'] = []
-        
-        tracking_data['processed'].append(entry)
+        new_entries.append(entry)
+        seen.add(key)
         print(f"  ✓ Marked as processed")
-        added_count += 1
     
-    # Save tracking data
+    added_count = len(new_entries)
+    
+    # Save tracking data once for the whole batch
     if added_count > 0:
+        tracking_data.setdefault('processed', []).extend(new_entries)
         save_tracking_data(tracking_data)
         print("\n" + "=" * 80)
         print("✓ Tracking file updated!")
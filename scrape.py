@@ -3,112 +3,121 @@
 ETaPprover - Thesis submission notification system
 Scrapes pending thesis submissions and sends Mattermost notifications
 """
-import requests
-from bs4 import BeautifulSoup
 import os
+import re
 import sys
 import json
-import smtplib
-import urllib3
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
-from io import StringIO
+import hashlib
+import logging
+import contextlib
+import functools
+import threading
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-# Disable SSL warnings for self-signed certificates
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+import requests
+
+from dm_shell import run_dm_shell
+from tracking import (
+    load_processed_submissions,
+    save_processed_submissions,
+    processed_keys,
+    mark_submission_processed,
+)
+
+# Resolve file locations once at import instead of on every call
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_CREDENTIALS_FILE = os.path.join(_SCRIPT_DIR, 'credentials.json')
+_COOKIES_FILE = os.path.join(_SCRIPT_DIR, 'session_cookies.txt')
+_MATTERMOST_CACHE_FILE = os.path.join(_SCRIPT_DIR, 'mattermost_cache.json')
 
 # ============================================================================
 # Logging System
 # ============================================================================
 
 class TeeOutput:
-    """Capture stdout/stderr while still printing to console."""
+    """Capture stdout/stderr while still printing to console.
+    
+    Use as a context manager to scope the redirect: the original streams
+    are restored on exit, even if the block raises. The captured log stays
+    in memory up to 1 MiB and spills to a temporary file beyond that; it
+    is released on exit, so call getvalue() inside the block.
+    """
     def __init__(self):
-        self.buffer = StringIO()
+        # Binary mode: a text-mode spool pays for TextIOWrapper.tell() on
+        # every write when checking whether to roll over
+        self.buffer = tempfile.SpooledTemporaryFile(max_size=1 << 20, mode='w+b')
         self.terminal = sys.stdout
+        self.terminal_err = sys.stderr
+        
+    def __enter__(self):
+        sys.stdout = self
+        sys.stderr = self
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        sys.stdout = self.terminal
+        sys.stderr = self.terminal_err
+        self.buffer.close()
+        return False
         
     def write(self, message):
         self.terminal.write(message)
-        self.buffer.write(message)
+        self.buffer.write(message.encode('utf-8', 'replace'))
         
     def flush(self):
         self.terminal.flush()
-        self.buffer.flush()
     
     def getvalue(self):
-        return self.buffer.getvalue()
-
-# ============================================================================
-# Submission Tracking Functions
-# ============================================================================
+        self.buffer.seek(0)
+        value = self.buffer.read().decode('utf-8')
+        self.buffer.seek(0, os.SEEK_END)
+        return value
 
-def load_processed_submissions():
-    """Load the list of already processed submissions."""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    tracking_file = os.path.join(script_dir, 'processed_submissions.json')
+class _StdoutHandler(logging.StreamHandler):
+    """Logging handler that writes to whatever sys.stdout currently is.
     
-    if not os.path.exists(tracking_file):
-        return {"processed": []}
+    Resolving the stream per record keeps log lines inside a TeeOutput
+    capture, exactly like print().
+    """
+    def __init__(self):
+        super().__init__(sys.stdout)
     
-    try:
-        with open(tracking_file, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return {"processed": []}
-
-def save_processed_submissions(tracking_data):
-    """Save the list of processed submissions."""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    tracking_file = os.path.join(script_dir, 'processed_submissions.json')
+    @property
+    def stream(self):
+        return sys.stdout
     
-    try:
-        with open(tracking_file, 'w') as f:
-            json.dump(tracking_data, f, indent=2)
-    except Exception as e:
-        print(f"⚠️  Warning: Could not save tracking data: {e}")
+    @stream.setter
+    def stream(self, value):
+        pass
 
-def is_submission_processed(record_id, author, tracking_data):
-    """Check if a submission has already been processed."""
-    for entry in tracking_data.get('processed', []):
-        if entry.get('record_id') == record_id and entry.get('author') == author:
-            return True
-    return False
-
-def mark_submission_processed(record_id, author, title, tracking_data):
-    """Mark a submission as processed."""
-    entry = {
-        'record_id': record_id,
-        'author': author,
-        'title': title,
-        'processed_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    }
-    
-    if 'processed' not in tracking_data:
-        tracking_data['processed'] = []
-    
-    tracking_data['processed'].append(entry)
-    return tracking_data
+# Per-request Mattermost chatter goes through this logger; progress lines are
+# DEBUG, so they cost nothing unless enabled (see --verbose / --quiet)
+logger = logging.getLogger('etapprover')
+if not logger.handlers:
+    # Configure once, even if this file is loaded both as __main__ and scrape
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    _log_handler = _StdoutHandler()
+    _log_handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(_log_handler)
 
 # ============================================================================
 # Credential Management
 # ============================================================================
 
+@functools.lru_cache(maxsize=1)
 def load_credentials():
-    """Load credentials from JSON file."""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    config_path = os.path.join(script_dir, 'credentials.json')
-
-    if not os.path.exists(config_path):
-        print(f"✗ Credentials file not found at {config_path}")
-        sys.exit(1)
-
+    """Load credentials from JSON file (read once per process)."""
     try:
-        with open(config_path, 'r') as file:
-            return json.load(file)
-    except json.JSONDecodeError:
+        with open(_CREDENTIALS_FILE, 'rb') as file:
+            return json.loads(file.read())
+    except FileNotFoundError:
+        print(f"✗ Credentials file not found at {_CREDENTIALS_FILE}")
+        sys.exit(1)
+    except ValueError:
         print(f"✗ Invalid JSON in credentials file")
         sys.exit(1)
 
@@ -116,13 +125,64 @@ def load_credentials():
 # Zenodo/Repository Functions
 # ============================================================================
 
-def login(login_url, email, password):
-    """Login to the repository system."""
+def create_session():
+    """Create a pooled HTTP session that retries transient server errors."""
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
     session = requests.Session()
+    retries = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'POST'])
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def login(login_url, email, password, api_url=None):
+    """Login to the repository system.
+    
+    Session cookies are persisted between runs. If `api_url` is given and
+    the saved cookies are still accepted by the API, the login form is
+    skipped entirely.
+    """
+    import http.cookiejar
+    from bs4 import BeautifulSoup, SoupStrainer
+    
+    session = create_session()
+    session.cookies = http.cookiejar.MozillaCookieJar(_COOKIES_FILE)
+    try:
+        session.cookies.load(ignore_discard=True)
+    except (FileNotFoundError, http.cookiejar.LoadError):
+        pass
+    
+    if api_url and len(session.cookies):
+        try:
+            # An expired session redirects to an HTML login page, so only a
+            # direct 200 with the expected JSON counts as still logged in
+            probe = session.get(
+                api_url,
+                headers={'Accept': 'application/vnd.zenodo.v1+json'},
+                params={'size': 1},
+                allow_redirects=False
+            )
+            if probe.status_code == 200:
+                data = json.loads(probe.content)
+                if isinstance(data, list) or (isinstance(data, dict) and 'hits' in data):
+                    print("✓ Reusing saved login session.")
+                    return session
+        except (requests.exceptions.RequestException, ValueError):
+            pass
+        session.cookies.clear()
 
     try:
         login_page = session.get(login_url)
-        soup = BeautifulSoup(login_page.text, 'html.parser')
+        # Only build tree nodes for the CSRF input instead of the whole page
+        csrf_only = SoupStrainer('input', {'id': 'csrf_token'})
+        soup = BeautifulSoup(login_page.text, 'html.parser', parse_only=csrf_only)
 
         csrf_token = soup.find('input', {'id': 'csrf_token'})
         if not csrf_token:
@@ -142,9 +202,19 @@ def login(login_url, email, password):
             print("✗ Login failed.")
             return None
 
-        soup_response = BeautifulSoup(response.text, 'html.parser')
-        if soup_response.find('a', href='/logout') or 'logout' in response.text.lower():
+        # A logout link implies 'logout' in the page, so no need to parse it
+        if 'logout' in response.text.lower():
             print("✓ Login successful.")
+            try:
+                # Restrict the file to its owner before any cookie is written
+                fd = os.open(_COOKIES_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                try:
+                    os.fchmod(fd, 0o600)
+                finally:
+                    os.close(fd)
+                session.cookies.save(ignore_discard=True)
+            except OSError as e:
+                print(f"⚠️  Warning: Could not save session cookies: {e}")
             return session
         else:
             print("✗ Login failed.")
@@ -160,7 +230,8 @@ def get_pending_submissions(session, api_url):
         response = session.get(api_url, headers=headers)
         response.raise_for_status()
 
-        data = response.json()
+        # Parse the raw bytes directly instead of decoding to text first
+        data = json.loads(response.content)
 
         all_submissions = []
         if isinstance(data, list):
@@ -180,7 +251,7 @@ def get_pending_submissions(session, api_url):
     except requests.exceptions.RequestException as e:
         print(f"✗ Error fetching submissions: {e}")
         return []
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         print(f"✗ Error parsing JSON response: {e}")
         return []
 
@@ -197,15 +268,14 @@ def extract_submission_data(submission):
     thesis_subtype = resource_type.get('subtype', 'N/A')
     
     # Get author (first creator)
-    creators = metadata.get('creators', [])
-    author = creators[0].get('name', 'N/A') if creators else 'N/A'
+    creators = metadata.get('creators') or ({},)
+    author = creators[0].get('name', 'N/A')
     
     # Get supervisors
-    supervisors = []
-    thesis = metadata.get('thesis', {})
-    thesis_supervisors = thesis.get('supervisors', [])
-    for supervisor in thesis_supervisors:
-        supervisors.append(supervisor.get('name', 'Unknown'))
+    supervisors = [
+        supervisor.get('name', 'Unknown')
+        for supervisor in metadata.get('thesis', {}).get('supervisors', ())
+    ]
     
     return {
         'record_id': record_id,
@@ -227,6 +297,7 @@ def process_all_submissions(session, api_url):
         return []
     
     tracking_data = load_processed_submissions()
+    processed = processed_keys(tracking_data)
     results = []
     for i, submission in enumerate(submissions, 1):
         print(f"\n{'='*60}")
@@ -235,7 +306,8 @@ def process_all_submissions(session, api_url):
         
         data = extract_submission_data(submission)
         
-        if is_submission_processed(data['record_id'], data['author'], tracking_data):
+        key = (data['record_id'], data['author'])
+        if key in processed:
             print(f"⏭ Skipping already processed submission: {data['title']}")
             continue
         
@@ -248,6 +320,7 @@ def process_all_submissions(session, api_url):
         
         results.append(data)
         tracking_data = mark_submission_processed(data['record_id'], data['author'], data['title'], tracking_data)
+        processed.add(key)
     
     save_processed_submissions(tracking_data)
     return results
@@ -256,64 +329,96 @@ def process_all_submissions(session, api_url):
 # Email Notification Functions
 # ============================================================================
 
+# Mail settings for the notification, status and error emails
+SMTP_CONFIG = {
+    'smtp_server': 'localhost',
+    'smtp_port': 25,
+    'from_email': 'etp-admin@lists.kit.edu',
+    'to_email': 'webadmin@etp.kit.edu',
+    'use_tls': False
+}
+
+def _attach_log(msg, log_content, prefix='etapprover_log'):
+    """Attach `log_content` to `msg` as a timestamped text file.
+    
+    Returns:
+        The attachment's filename
+    """
+    from email.mime.base import MIMEBase
+    from email import encoders
+    
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    log_filename = f"{prefix}_{timestamp}.txt"
+    
+    attachment = MIMEBase('application', 'octet-stream')
+    attachment.set_payload(log_content.encode('utf-8'))
+    encoders.encode_base64(attachment)
+    attachment.add_header('Content-Disposition', f'attachment; filename={log_filename}')
+    msg.attach(attachment)
+    return log_filename
+
+def _send_email(msg, smtp_config):
+    """Deliver `msg` over a single SMTP connection; raises on failure."""
+    import smtplib
+    
+    smtp_server = smtp_config.get('smtp_server', 'localhost')
+    smtp_port = smtp_config.get('smtp_port', 25)
+    
+    with smtplib.SMTP(smtp_server, smtp_port) as server:
+        if smtp_config.get('use_tls', False):
+            server.starttls()
+        
+        if 'smtp_user' in smtp_config and 'smtp_password' in smtp_config:
+            server.login(smtp_config['smtp_user'], smtp_config['smtp_password'])
+        
+        server.send_message(msg)
+
 def send_notification_email(submissions, smtp_config, log_content=None):
     """Send email notification about pending submissions with optional log attachment."""
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+    
     if not submissions:
         return False
     
     subject = f"New Pending Thesis Submissions - {len(submissions)} item(s)"
     
-    body = f"Hello,\n\n"
-    body += f"There are {len(submissions)} new thesis submission(s) pending approval:\n\n"
+    # Collect the body in a list and join once instead of repeated +=
+    parts = [
+        "Hello,\n\n",
+        f"There are {len(submissions)} new thesis submission(s) pending approval:\n\n"
+    ]
     
     for i, sub in enumerate(submissions, 1):
-        body += f"{i}. {sub['title']}\n"
-        body += f"   Author: {sub['author']}\n"
-        body += f"   Supervisors: {', '.join(sub['supervisors'])}\n"
-        body += f"   Type: {sub['thesis_type']}\n\n"
+        parts.append(
+            f"{i}. {sub['title']}\n"
+            f"   Author: {sub['author']}\n"
+            f"   Supervisors: {', '.join(sub['supervisors'])}\n"
+            f"   Type: {sub['thesis_type']}\n\n"
+        )
     
-    body += "Please review and approve these submissions.\n\n"
+    parts.append("Please review and approve these submissions.\n\n")
     
     if log_content:
-        body += "See attached log file for detailed execution information.\n\n"
+        parts.append("See attached log file for detailed execution information.\n\n")
     
-    body += "Best regards,\n"
-    body += "ETaPprover"
+    parts.append("Best regards,\nETaPprover")
+    body = "".join(parts)
     
     msg = MIMEMultipart()
     msg['From'] = smtp_config.get('from_email', 'etp-admin@lists.kit.edu')
     msg['To'] = smtp_config.get('to_email', 'webadmin@etp.kit.edu')
     msg['Subject'] = subject
-    msg.attach(MIMEText(body, 'plain'))
+    msg.attach(MIMEText(body, 'plain', 'utf-8'))
     
     # Attach log file if provided
     if log_content:
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        log_filename = f"etapprover_log_{timestamp}.txt"
-        
-        attachment = MIMEBase('application', 'octet-stream')
-        attachment.set_payload(log_content.encode('utf-8'))
-        encoders.encode_base64(attachment)
-        attachment.add_header('Content-Disposition', f'attachment; filename={log_filename}')
-        msg.attach(attachment)
-        
+        log_filename = _attach_log(msg, log_content)
         print(f"✓ Log file attached: {log_filename} ({len(log_content)} bytes)")
     
     try:
-        smtp_server = smtp_config.get('smtp_server', 'localhost')
-        smtp_port = smtp_config.get('smtp_port', 25)
-        
         print(f"\n📧 Sending notification email to {msg['To']}...")
-        
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            if smtp_config.get('use_tls', False):
-                server.starttls()
-            
-            if 'smtp_user' in smtp_config and 'smtp_password' in smtp_config:
-                server.login(smtp_config['smtp_user'], smtp_config['smtp_password'])
-            
-            server.send_message(msg)
-        
+        _send_email(msg, smtp_config)
         print("✓ Email sent successfully!")
         return True
         
@@ -325,202 +430,556 @@ def send_notification_email(submissions, smtp_config, log_content=None):
 # Mattermost Functions
 # ============================================================================
 
+_MATTERMOST_SESSION = None
+_MATTERMOST_SESSION_LOCK = threading.Lock()
+# Keep-alive connections per Mattermost host; also caps the number of DM
+# workers so every worker reuses a pooled connection instead of opening one
+_MATTERMOST_POOL_SIZE = 16
+
+# In-process caches for Mattermost lookups that repeat across submissions
+_USER_CACHE_TTL = 600  # seconds
+_USER_CACHE_MAXSIZE = 512
+_user_cache = {}  # (api_url, username) -> (expires_at, user)
+# Lookups run on DM worker threads; evicting while another thread inserts
+# would break the iteration in next(iter(...)). Guards both user caches
+_USER_CACHE_LOCK = threading.Lock()
+_missing_user_cache = {}  # (api_url, username) -> expires_at, for 404s
+_group_channel_cache = {}  # frozenset of member IDs -> group channel_id
+# Supervisor/author name -> verified username, for this run
+_resolved_username_cache = {}
+
+def clear_username_caches():
+    """Forget in-memory user lookups and resolved names (start of a run)."""
+    with _USER_CACHE_LOCK:
+        _user_cache.clear()
+        _missing_user_cache.clear()
+    _resolved_username_cache.clear()
+    _generate_username_variants.cache_clear()
+
+# DM channel IDs never change, so they are kept on disk between runs, together
+# with the last seen bot identity per token and recently found users. Layout:
+# {"bots": {"<api_url>|<token hash>": user},
+#  "dm_channels": {"<bot_id>:<target_user_id>": channel_id},
+#  "users": {"<api_url>|<username>": [expires_at (epoch seconds), user]}}
+_PERSISTENT_USER_TTL = 3600  # seconds
+_mattermost_cache = None
+_MATTERMOST_CACHE_LOCK = threading.Lock()
+# Serializes whole writes of the cache file (dump, write and replace)
+_MATTERMOST_CACHE_SAVE_LOCK = threading.Lock()
+_cache_save_depth = 0  # > 0 inside _deferred_cache_saves()
+_cache_dirty = False
+
+def _get_mattermost_cache():
+    """Return the persistent Mattermost cache, loading it on first use."""
+    global _mattermost_cache
+    with _MATTERMOST_CACHE_LOCK:
+        if _mattermost_cache is None:
+            try:
+                with open(_MATTERMOST_CACHE_FILE, 'rb') as f:
+                    _mattermost_cache = json.loads(f.read())
+            except (ValueError, FileNotFoundError):
+                _mattermost_cache = {}
+            _mattermost_cache.setdefault('bots', {})
+            _mattermost_cache.setdefault('dm_channels', {})
+            # Drop users that expired since the last run
+            now = time.time()
+            _mattermost_cache['users'] = {
+                key: entry
+                for key, entry in _mattermost_cache.get('users', {}).items()
+                if entry[0] > now
+            }
+    return _mattermost_cache
+
+def _save_mattermost_cache():
+    """Write the persistent Mattermost cache back to disk.
+    
+    Inside _deferred_cache_saves() this only marks the cache dirty; the
+    block writes it once on exit.
+    """
+    global _cache_dirty
+    cache = _get_mattermost_cache()
+    with _MATTERMOST_CACHE_LOCK:
+        if _cache_save_depth:
+            _cache_dirty = True
+            return
+    
+    with _MATTERMOST_CACHE_SAVE_LOCK:
+        tmp_file = None
+        try:
+            with _MATTERMOST_CACHE_LOCK:
+                payload = json.dumps(cache, separators=(',', ':'))
+                _cache_dirty = False
+            # A unique temp file keeps concurrent runs from clobbering it
+            fd, tmp_file = tempfile.mkstemp(
+                dir=_SCRIPT_DIR, prefix='mattermost_cache.', suffix='.tmp'
+            )
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp_file, _MATTERMOST_CACHE_FILE)
+        except Exception as e:
+            print(f"⚠️  Warning: Could not save Mattermost cache: {e}")
+            if tmp_file and os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+@contextlib.contextmanager
+def _deferred_cache_saves():
+    """Collect persistent cache writes made in the block into one save."""
+    global _cache_save_depth
+    with _MATTERMOST_CACHE_LOCK:
+        _cache_save_depth += 1
+    try:
+        yield
+    finally:
+        with _MATTERMOST_CACHE_LOCK:
+            _cache_save_depth -= 1
+            flush = not _cache_save_depth and _cache_dirty
+        if flush:
+            _save_mattermost_cache()
+
+def _remember_dm_channel(dm_key, channel_id):
+    """Record a DM channel ID in the persistent cache."""
+    cache = _get_mattermost_cache()
+    with _MATTERMOST_CACHE_LOCK:
+        cache['dm_channels'][dm_key] = channel_id
+    _save_mattermost_cache()
+
+def _forget_dm_channel(bot_id, target_user_id):
+    """Drop one cached DM channel ID (e.g. after the post to it failed)."""
+    cache = _get_mattermost_cache()
+    with _MATTERMOST_CACHE_LOCK:
+        removed = cache['dm_channels'].pop(f"{bot_id}:{target_user_id}", None)
+    if removed:
+        _save_mattermost_cache()
+
+def _forget_bot(api_url, token):
+    """Drop the bot identity recorded for `token` (e.g. after a 401)."""
+    cache = _get_mattermost_cache()
+    with _MATTERMOST_CACHE_LOCK:
+        removed = cache['bots'].pop(_bot_cache_key(api_url, token), None)
+    if removed:
+        _save_mattermost_cache()
+
+def get_mattermost_session(token=None):
+    """Return the shared Mattermost HTTP session, creating it on first use.
+    
+    Reusing one session keeps the TCP/TLS connection to the Mattermost host
+    alive across calls instead of handshaking for every request.
+    
+    Args:
+        token: Optional bot token; installed as the session's default
+            Authorization header if it differs from the current one
+    """
+    global _MATTERMOST_SESSION
+    with _MATTERMOST_SESSION_LOCK:
+        if _MATTERMOST_SESSION is None:
+            _MATTERMOST_SESSION = _create_mattermost_session()
+        if token is not None and token != _MATTERMOST_SESSION.token:
+            _set_session_token(_MATTERMOST_SESSION, token)
+    return _MATTERMOST_SESSION
+
+def set_auth(token):
+    """Use `token` for all following Mattermost requests (token rotation)."""
+    get_mattermost_session(token)
+
+def _set_session_token(session, token):
+    """Install `token` as the session's default Authorization header."""
+    session.headers['Authorization'] = f'Bearer {token}'
+    session.token = token
+
+def _create_mattermost_session():
+    """Build the pooled, retrying session used for all Mattermost calls."""
+    import urllib3
+    import ssl
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    # One non-verifying TLS context shared by every pooled connection,
+    # instead of urllib3 building a fresh context per connection
+    tls_context = ssl.create_default_context()
+    tls_context.check_hostname = False
+    tls_context.verify_mode = ssl.CERT_NONE
+    
+    class _UnverifiedTLSAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args, **kwargs):
+            kwargs['ssl_context'] = tls_context
+            return super().init_poolmanager(*args, **kwargs)
+    
+    # Mattermost uses a self-signed certificate; verification is turned off
+    # once on the session and the resulting warning silenced once here
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    session = requests.Session()
+    session.verify = False
+    # Every Mattermost call sends JSON; the token is added by get_mattermost_session()
+    session.headers['Content-Type'] = 'application/json'
+    session.token = None
+    # Only idempotent methods are retried, so a post is never sent twice
+    retries = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504)
+    )
+    adapter = _UnverifiedTLSAdapter(
+        pool_connections=8,
+        pool_maxsize=_MATTERMOST_POOL_SIZE,
+        max_retries=retries
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
 def test_mattermost_connection(api_url, token):
     """Test Mattermost connection and get bot info."""
-    headers = {
-        'Authorization': f'Bearer {token}',
-        'Content-Type': 'application/json'
-    }
+    session = get_mattermost_session(token)
     
     try:
-        print("🔌 Testing Mattermost connection...")
-        response = requests.get(f"{api_url}/v4/users/me", headers=headers, verify=False)
+        logger.debug("🔌 Testing Mattermost connection...")
+        response = session.get(f"{api_url}/v4/users/me")
         response.raise_for_status()
-        user = response.json()
-        print(f"✓ Connected as: {user['username']} ({user['id']})")
+        user = json.loads(response.content)
+        logger.info("✓ Connected as: %s (%s)", user['username'], user['id'])
         return True, user
     except Exception as e:
-        print(f"✗ Connection failed: {e}")
+        logger.error("✗ Connection failed: %s", e)
         return False, None
 
+def _bot_cache_key(api_url, token):
+    """Key of a bot's entry in the persistent cache (never the raw token)."""
+    return f"{api_url}|{hashlib.sha256(token.encode()).hexdigest()[:16]}"
+
+def get_bot_user(api_url, token):
+    """Return the bot's user object, validating the token with the server.
+    
+    Always calls test_mattermost_connection(), so a revoked token or an
+    unreachable server is reported as a failed connection. The bot
+    identity is recorded in the on-disk cache; if it changed for this
+    token, the DM channels cached for the previous bot are dropped.
+    
+    Returns:
+        Tuple (success, bot_user) like test_mattermost_connection()
+    """
+    success, user = test_mattermost_connection(api_url, token)
+    if not success:
+        return success, user
+    
+    key = _bot_cache_key(api_url, token)
+    cache = _get_mattermost_cache()
+    identity = {'id': user['id'], 'username': user['username']}
+    with _MATTERMOST_CACHE_LOCK:
+        previous = cache['bots'].get(key)
+        changed = previous != identity
+        if changed:
+            cache['bots'][key] = identity
+            if previous:
+                prefix = f"{previous['id']}:"
+                for dm_key in [k for k in cache['dm_channels'] if k.startswith(prefix)]:
+                    del cache['dm_channels'][dm_key]
+    if changed:
+        _save_mattermost_cache()
+    return success, user
+
 def get_user_by_username(api_url, token, username):
-    """Look up a user by username."""
-    headers = {
-        'Authorization': f'Bearer {token}',
-        'Content-Type': 'application/json'
-    }
+    """Look up a user by username.
+    
+    Successful lookups are cached for _USER_CACHE_TTL seconds in memory
+    and _PERSISTENT_USER_TTL seconds on disk, so a supervisor appearing in
+    several submissions (or runs) costs one request.
+    """
+    user = _cached_user(api_url, username)
+    if user:
+        logger.info("✓ Found user: %s (%s) [cached]", user['username'], user['id'])
+        return user
+    
+    session = get_mattermost_session(token)
     
     try:
-        print(f"🔍 Looking up user: {username}")
-        response = requests.get(
-            f"{api_url}/v4/users/username/{username}",
-            headers=headers,
-            verify=False
+        logger.debug("🔍 Looking up user: %s", username)
+        response = session.get(
+            f"{api_url}/v4/users/username/{username}"
         )
         response.raise_for_status()
-        user = response.json()
-        print(f"✓ Found user: {user['username']} ({user['id']})")
+        user = json.loads(response.content)
+        logger.info("✓ Found user: %s (%s)", user['username'], user['id'])
+        _cache_user(api_url, username, user)
         return user
     except Exception as e:
-        print(f"✗ User lookup failed: {e}")
+        logger.error("✗ User lookup failed: %s", e)
         return None
 
+def _cached_user(api_url, username):
+    """Return a cached user from memory or from disk, or None."""
+    cached = _user_cache.get((api_url, username))
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    
+    entry = _get_mattermost_cache()['users'].get(f"{api_url}|{username}")
+    if entry and entry[0] > time.time():
+        _cache_user(api_url, username, entry[1], persist=False)
+        return entry[1]
+    return None
+
+def _remember_missing(api_url, username):
+    """Record a 404 for username so it is not probed again for a while."""
+    with _USER_CACHE_LOCK:
+        if len(_missing_user_cache) >= _USER_CACHE_MAXSIZE:
+            _missing_user_cache.pop(next(iter(_missing_user_cache)), None)
+        _missing_user_cache[(api_url, username)] = time.monotonic() + _USER_CACHE_TTL
+
+def _cache_user(api_url, username, user, persist=True):
+    """Store a successful user lookup in the TTL cache.
+    
+    Args:
+        persist: Also write it to the on-disk cache right away; batch
+            callers pass False and save once at the end
+    """
+    with _USER_CACHE_LOCK:
+        if len(_user_cache) >= _USER_CACHE_MAXSIZE:
+            # Drop the oldest entry (dicts keep insertion order)
+            _user_cache.pop(next(iter(_user_cache)), None)
+        _user_cache[(api_url, username)] = (time.monotonic() + _USER_CACHE_TTL, user)
+    
+    cache = _get_mattermost_cache()
+    with _MATTERMOST_CACHE_LOCK:
+        cache['users'][f"{api_url}|{username}"] = [time.time() + _PERSISTENT_USER_TTL, user]
+    if persist:
+        _save_mattermost_cache()
+
+def get_users_by_usernames(api_url, token, usernames):
+    """Look up several users with a single request.
+    
+    Args:
+        api_url: Mattermost API base URL
+        token: Bot token
+        usernames: Iterable of usernames
+    
+    Returns:
+        Dict mapping each found username to its user object; usernames
+        that do not exist are missing from the dict
+    """
+    users = {}
+    missing = []
+    now = time.monotonic()
+    for username in usernames:
+        user = _cached_user(api_url, username)
+        if user:
+            users[username] = user
+        elif _missing_user_cache.get((api_url, username), 0) > now:
+            continue  # known not to exist
+        elif username not in missing:
+            missing.append(username)
+    
+    if not missing:
+        return users
+    
+    session = get_mattermost_session(token)
+    
+    try:
+        logger.debug("🔍 Looking up users: %s", ', '.join(missing))
+        response = session.post(
+            f"{api_url}/v4/users/usernames",
+            json=missing
+        )
+        response.raise_for_status()
+        # Mattermost stores usernames in lower case
+        found = {user['username']: user for user in json.loads(response.content)}
+    except Exception as e:
+        # Older servers or restricted bots may reject the bulk endpoint;
+        # fall back to one GET per name rather than reporting nobody found
+        logger.debug("  Bulk user lookup failed (%s), checking one by one", e)
+        for username in missing:
+            if try_username_with_mattermost(api_url, token, username):
+                users[username] = _cached_user(api_url, username)
+        return users
+    
+    for username in missing:
+        user = found.get(username.lower())
+        if user:
+            logger.info("✓ Found user: %s (%s)", user['username'], user['id'])
+            _cache_user(api_url, username, user, persist=False)
+            users[username] = user
+        else:
+            _remember_missing(api_url, username)
+    
+    if found:
+        _save_mattermost_cache()
+    
+    return users
+
+def bulk_check_usernames(api_url, token, usernames):
+    """Return the subset of `usernames` that exist, using one request."""
+    return set(get_users_by_usernames(api_url, token, usernames))
+
 def search_user(api_url, token, search_term):
     """Search for a user by name or username."""
-    headers = {
-        'Authorization': f'Bearer {token}',
-        'Content-Type': 'application/json'
-    }
+    session = get_mattermost_session(token)
     
     try:
-        print(f"🔍 Searching for user: {search_term}")
+        logger.debug("🔍 Searching for user: %s", search_term)
         
-        response = requests.get(
+        response = session.get(
             f"{api_url}/v4/users/search",
-            headers=headers,
-            params={"term": search_term},
-            verify=False
+            params={"term": search_term}
         )
         response.raise_for_status()
-        users = response.json()
+        users = json.loads(response.content)
         
         if users:
-            print(f"✓ Found {len(users)} user(s):")
+            logger.info("✓ Found %d user(s):", len(users))
             for user in users[:5]:
-                print(f"  - {user.get('username')} (ID: {user['id']}) - {user.get('first_name', '')} {user.get('last_name', '')}")
+                logger.info(
+                    "  - %s (ID: %s) - %s %s",
+                    user.get('username'), user['id'],
+                    user.get('first_name', ''), user.get('last_name', '')
+                )
             return users
         else:
-            print("✗ No users found")
+            logger.error("✗ No users found")
             return []
     except Exception as e:
-        print(f"✗ Search failed: {e}")
+        logger.error("✗ Search failed: %s", e)
         
         # Try direct username lookup
         try:
-            print(f"  Trying direct username lookup...")
+            logger.debug("  Trying direct username lookup...")
             return [get_user_by_username(api_url, token, search_term)]
         except:
-            print(f"✗ Username lookup also failed")
+            logger.error("✗ Username lookup also failed")
             return []
 
 def create_dm_channel(api_url, token, bot_id, target_user_id):
     """Create or get a DM channel between bot and target user."""
-    headers = {
-        'Authorization': f'Bearer {token}',
-        'Content-Type': 'application/json'
-    }
+    dm_channels = _get_mattermost_cache()['dm_channels']
+    dm_key = f"{bot_id}:{target_user_id}"
+    channel_id = dm_channels.get(dm_key)
+    if channel_id:
+        logger.info("✓ DM channel ready: %s [cached]", channel_id)
+        return channel_id
+    
+    session = get_mattermost_session(token)
     
     try:
-        print("📨 Creating/getting DM channel...")
-        response = requests.post(
-            f"{api_url}/v4/channels/direct",
-            headers=headers,
-            json=[bot_id, target_user_id],
-            verify=False
-        )
+        logger.debug("📨 Creating/getting DM channel...")
+        # The session does not retry POSTs, but this one just returns the
+        # existing channel when repeated, so retry server errors here
+        for attempt in range(3):
+            if attempt:
+                time.sleep(0.2 * 2 ** attempt)
+            response = session.post(
+                f"{api_url}/v4/channels/direct",
+                json=[bot_id, target_user_id]
+            )
+            if response.status_code not in (500, 502, 503, 504):
+                break
         
         if response.status_code in [200, 201]:
-            channel = response.json()
-            print(f"✓ DM channel ready: {channel['id']}")
+            channel = json.loads(response.content)
+            logger.info("✓ DM channel ready: %s", channel['id'])
+            _remember_dm_channel(dm_key, channel['id'])
             return channel['id']
         
-        # If creation failed, try to find existing DM
-        print("  Searching for existing DM channel...")
-        channels_response = requests.get(
-            f"{api_url}/v4/users/{bot_id}/channels",
-            headers=headers,
-            verify=False
+        if response.status_code not in (403, 409):
+            # Only a refusal or conflict can mean the DM already exists; bad
+            # input, auth failures and server errors would not list it either
+            logger.error("✗ DM channel creation failed: %s", response.status_code)
+            return None
+        
+        # Creation was refused, so try to find an existing DM
+        logger.debug("  Searching for existing DM channel...")
+        channels_response = session.get(
+            f"{api_url}/v4/users/{bot_id}/channels"
         )
         channels_response.raise_for_status()
-        channels = channels_response.json()
+        channels = json.loads(channels_response.content)
         
+        # DM channels are named after both user IDs in sorted order, so the
+        # match needs no per-channel member requests
+        dm_name = '__'.join(sorted([bot_id, target_user_id]))
         for ch in channels:
-            if ch.get('type') == 'D':
-                try:
-                    members_response = requests.get(
-                        f"{api_url}/v4/channels/{ch['id']}/members",
-                        headers=headers,
-                        verify=False
-                    )
-                    if members_response.status_code == 200:
-                        members = members_response.json()
-                        member_ids = [m['user_id'] for m in members]
-                        if target_user_id in member_ids and bot_id in member_ids:
-                            print(f"✓ Found existing DM channel: {ch['id']}")
-                            return ch['id']
-                except:
-                    continue
+            if ch.get('type') == 'D' and ch.get('name') == dm_name:
+                logger.info("✓ Found existing DM channel: %s", ch['id'])
+                _remember_dm_channel(dm_key, ch['id'])
+                return ch['id']
         
-        print("✗ Could not create or find DM channel")
+        logger.error("✗ Could not create or find DM channel")
         return None
         
     except Exception as e:
-        print(f"✗ DM channel creation failed: {e}")
+        logger.error("✗ DM channel creation failed: %s", e)
         return None
 
 def create_group_dm_channel(api_url, token, bot_id, user_ids):
     """Create a group DM channel with multiple users."""
-    headers = {
-        'Authorization': f'Bearer {token}',
-        'Content-Type': 'application/json'
-    }
+    # Include bot in the group
+    all_user_ids = [bot_id] + user_ids
+    
+    # Group channels are unique per member set, whatever the order
+    members = frozenset(all_user_ids)
+    channel_id = _group_channel_cache.get(members)
+    if channel_id:
+        logger.info("✓ Group DM channel ready: %s [cached]", channel_id)
+        return channel_id
+    
+    session = get_mattermost_session(token)
     
     try:
-        print(f"👥 Creating group DM with {len(user_ids)} participants...")
+        logger.debug("👥 Creating group DM with %d participants...", len(user_ids))
         
-        # Include bot in the group
-        all_user_ids = [bot_id] + user_ids
-        
-        response = requests.post(
+        response = session.post(
             f"{api_url}/v4/channels/group",
-            headers=headers,
-            json=all_user_ids,
-            verify=False
+            json=all_user_ids
         )
         
         if response.status_code in [200, 201]:
-            channel = response.json()
-            print(f"✓ Group DM channel ready: {channel['id']}")
+            channel = json.loads(response.content)
+            logger.info("✓ Group DM channel ready: %s", channel['id'])
+            _group_channel_cache[members] = channel['id']
             return channel['id']
         else:
-            print(f"✗ Failed to create group DM: {response.status_code}")
-            print(f"  Response: {response.text}")
+            logger.error("✗ Failed to create group DM: %s", response.status_code)
+            logger.error("  Response: %s", response.text)
             return None
         
     except Exception as e:
-        print(f"✗ Group DM creation failed: {e}")
+        logger.error("✗ Group DM creation failed: %s", e)
         return None
 
-def send_message_to_channel(api_url, token, channel_id, message):
-    """Send a message to a specific channel."""
-    headers = {
-        'Authorization': f'Bearer {token}',
-        'Content-Type': 'application/json'
-    }
+def _post_to_channel(api_url, token, channel_id, message):
+    """Post `message` to a channel.
+    
+    Returns:
+        The HTTP status code, or None if no response was received
+    """
+    session = get_mattermost_session(token)
     
     try:
-        print("📤 Sending message...")
+        logger.debug("📤 Sending message...")
         post_payload = {
             'channel_id': channel_id,
             'message': message
         }
         
-        response = requests.post(
+        response = session.post(
             f"{api_url}/v4/posts",
-            headers=headers,
-            json=post_payload,
-            verify=False
+            json=post_payload
         )
         
+        if response.status_code == 401:
+            # The token was rejected; forget the bot identity recorded for it
+            _forget_bot(api_url, token)
         response.raise_for_status()
-        print("✓ Message sent successfully!")
-        return True
+        logger.info("✓ Message sent successfully!")
+        return response.status_code
         
     except Exception as e:
-        print(f"✗ Failed to send message: {e}")
+        logger.error("✗ Failed to send message: %s", e)
         if hasattr(e, 'response') and e.response is not None:
-            print(f"  Error details: {e.response.text}")
-        return False
+            logger.error("  Error details: %s", e.response.text)
+            return e.response.status_code
+        return None
+
+def send_message_to_channel(api_url, token, channel_id, message):
+    """Send a message to a specific channel."""
+    status = _post_to_channel(api_url, token, channel_id, message)
+    return status is not None and 200 <= status < 300
 
 def send_dm_to_user(api_url, token, bot_id, username, message):
     """Send a DM to a specific user."""
@@ -528,21 +987,34 @@ def send_dm_to_user(api_url, token, bot_id, username, message):
     if not target_user:
         return False
     
-    channel_id = create_dm_channel(api_url, token, bot_id, target_user['id'])
-    if not channel_id:
-        print("\n💡 TIP: Try opening Mattermost and starting a DM with the bot first!")
-        return False
-    
-    return send_message_to_channel(api_url, token, channel_id, message)
+    for attempt in range(2):
+        channel_id = create_dm_channel(api_url, token, bot_id, target_user['id'])
+        if not channel_id:
+            print("\n💡 TIP: Try opening Mattermost and starting a DM with the bot first!")
+            return False
+        
+        status = _post_to_channel(api_url, token, channel_id, message)
+        if status is not None and 200 <= status < 300:
+            return True
+        if attempt or status not in (401, 403, 404):
+            return False
+        
+        # The cached channel ID may be stale: drop just that entry, then
+        # look the channel up again and retry once
+        logger.info("  Retrying with a fresh DM channel...")
+        _forget_dm_channel(bot_id, target_user['id'])
+    return False
 
 def send_group_dm(api_url, token, bot_id, usernames, message):
     """Send a message to a group DM with multiple users."""
     print(f"👥 Setting up group DM with: {', '.join(usernames)}")
     
-    # Look up all target users
+    # Look up all target users in one request
+    users = get_users_by_usernames(api_url, token, usernames)
+    
     user_ids = []
     for username in usernames:
-        user = get_user_by_username(api_url, token, username)
+        user = users.get(username)
         if not user:
             print(f"❌ Failed to find user: {username}")
             return False
@@ -562,21 +1034,31 @@ def send_dm_to_multiple_users(api_url, token, bot_id, usernames, message):
     
     print(f"📬 Sending message to {len(usernames)} users...")
     
-    for i, username in enumerate(usernames, 1):
-        print(f"\n[{i}/{len(usernames)}] Processing @{username}...")
-        
-        success = send_dm_to_user(api_url, token, bot_id, username, message)
+    # Resolve everyone in one request; send_dm_to_user then hits the cache
+    get_users_by_usernames(api_url, token, usernames)
+    
+    # The DMs are independent, so send them in parallel over the shared
+    # session; new DM channel IDs are persisted once, after the fan-out
+    with _deferred_cache_saves(), ThreadPoolExecutor(max_workers=max(1, min(_MATTERMOST_POOL_SIZE, len(usernames)))) as executor:
+        futures = {
+            username: executor.submit(send_dm_to_user, api_url, token, bot_id, username, message)
+            for username in usernames
+        }
+    
+    for i, (username, future) in enumerate(futures.items(), 1):
+        success = future.result()
         results[username] = success
         
         if success:
-            print(f"  ✅ Success")
+            print(f"[{i}/{len(usernames)}] @{username}: ✅ Success")
         else:
-            print(f"  ❌ Failed")
+            print(f"[{i}/{len(usernames)}] @{username}: ❌ Failed")
     
     # Summary
     print(f"\n📊 Summary:")
-    successful = [user for user, success in results.items() if success]
-    failed = [user for user, success in results.items() if not success]
+    successful, failed = [], []
+    for user, success in results.items():
+        (successful if success else failed).append(user)
     
     print(f"  ✅ Successful: {len(successful)}")
     if successful:
@@ -593,25 +1075,78 @@ def format_submission_message(submissions):
     if not submissions:
         return "No pending submissions."
     
-    message = f"## 📚 Pending Thesis Submissions ({len(submissions)})\n\n"
-    
-    for i, sub in enumerate(submissions, 1):
-        message += f"### {i}. {sub['title']}\n"
-        message += f"- **Author**: {sub['author']}\n"
-        message += f"- **Type**: {sub['thesis_type']}\n"
-        if sub['supervisors']:
-            message += f"- **Supervisors**: {', '.join(sub['supervisors'])}\n"
-        message += f"- **Status**: {sub['approval_status']}\n"
-        message += f"- **Record ID**: {sub['record_id']}\n\n"
-    
-    message += "\n---\n_Automated notification from ETaPprover_"
+    # Freeze the dicts into a hashable key so repeat calls hit the cache
+    key = tuple(
+        (
+            sub['title'],
+            sub['author'],
+            sub['thesis_type'],
+            tuple(sub['supervisors']),
+            sub['approval_status'],
+            sub['record_id'],
+        )
+        for sub in submissions
+    )
+    return _format_submission_message(key)
+
+@functools.lru_cache(maxsize=32)
+def _format_submission_message(submissions):
+    """Build the message for a tuple of frozen submissions."""
+    parts = [f"## 📚 Pending Thesis Submissions ({len(submissions)})\n\n"]
+    
+    for i, (title, author, thesis_type, supervisors, status, record_id) in enumerate(submissions, 1):
+        parts.append(f"### {i}. {title}\n")
+        parts.append(f"- **Author**: {author}\n")
+        parts.append(f"- **Type**: {thesis_type}\n")
+        if supervisors:
+            parts.append(f"- **Supervisors**: {', '.join(supervisors)}\n")
+        parts.append(f"- **Status**: {status}\n")
+        parts.append(f"- **Record ID**: {record_id}\n\n")
+    
+    parts.append("\n---\n_Automated notification from ETaPprover_")
+    
+    return "".join(parts)
+
+def notify_users_about_submissions(api_url, token, bot_id, usernames, submissions):
+    """Send the formatted submission list to each user as an individual DM.
     
-    return message
+    The message is formatted once here and reused for every recipient;
+    don't call format_submission_message inside per-user loops.
+    """
+    message = format_submission_message(submissions)
+    return send_dm_to_multiple_users(api_url, token, bot_id, usernames, message)
 
 # ============================================================================
 # Main Program
 # ============================================================================
 
+# Umlaut/accent transliteration used when building usernames
+_UMLAUT_TABLE = str.maketrans({
+    'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss',
+    'á': 'a', 'é': 'e', 'í': 'i', 'ó': 'o', 'ú': 'u'
+})
+
+# Characters stripped from name parts when building usernames
+_USERNAME_CLEAN_RE = re.compile(r'[^\w\-]')
+
+# "<a>" or "<a>, <b>[, ...]" with whitespace around the parts stripped
+_NAME_RE = re.compile(r'\s*(?P<a>[^,]*?)\s*(?:,\s*(?P<b>[^,]*?)\s*(?:,.*)?)?', re.DOTALL)
+# Academic titles anywhere in the first part ('prof' also covers 'professor')
+_TITLE_RE = re.compile(r'prof|dr|doktor', re.IGNORECASE)
+
+def _normalize_for_username(text):
+    """Lowercase `text`, transliterate umlauts and strip other characters."""
+    text = text.lower()
+    # Most names are plain ASCII already: nothing to transliterate, and
+    # usually nothing to strip either
+    if text.isascii():
+        if text.replace('-', '').isalnum():
+            return text
+    else:
+        text = text.translate(_UMLAUT_TABLE)
+    # Remove spaces and special characters except hyphens
+    return _USERNAME_CLEAN_RE.sub('', text)
+
 def try_username_with_mattermost(api_url, token, username):
     """Test if a username exists in Mattermost.
     
@@ -623,72 +1158,95 @@ def try_username_with_mattermost(api_url, token, username):
     Returns:
         True if user exists, False otherwise
     """
-    headers = {
-        'Authorization': f'Bearer {token}',
-        'Content-Type': 'application/json'
-    }
+    # Answer from earlier lookups; recurring supervisors probe only once
+    key = (api_url, username)
+    now = time.monotonic()
+    if _cached_user(api_url, username):
+        return True
+    if _missing_user_cache.get(key, 0) > now:
+        return False
+    
+    session = get_mattermost_session(token)
     
     try:
-        response = requests.get(
+        # Short timeouts: this runs once per candidate variant, and a hung
+        # probe should fail over to the next one quickly
+        response = session.get(
             f"{api_url}/v4/users/username/{username}",
-            headers=headers,
-            verify=False
+            timeout=(3, 5)
         )
-        return response.status_code == 200
-    except:
+    except requests.exceptions.RequestException:
         return False
+    
+    if response.status_code == 200:
+        try:
+            user = json.loads(response.content)
+        except ValueError:
+            return False
+        _cache_user(api_url, username, user)
+        return True
+    if response.status_code == 404:
+        _remember_missing(api_url, username)
+    return False
 
-def generate_username_variants(supervisor_name):
-    """Generate possible Mattermost username variants from a supervisor name.
+def probe_variants(api_url, token, variants):
+    """Return the most likely variant that exists in Mattermost.
+    
+    Variants are walked in order against the user caches, stopping at the
+    first known user; the first unknown variant and everything after it
+    are then checked with a single bulk request.
     
     Args:
-        supervisor_name: Name in any format:
-            - "Lastname, Firstname" (standard academic format)
-            - "Firstname, Lastname" (reversed with comma)
-            - "Firstname Lastname" (natural order)
-            - "Lastname" (single name)
+        api_url: Mattermost API URL
+        token: API token
+        variants: Username variants in order of likelihood
     
     Returns:
-        List of username variants to try (in order of likelihood)
+        The first existing variant, or None if none exists
     """
-    import re
+    now = time.monotonic()
+    for i, variant in enumerate(variants):
+        if _cached_user(api_url, variant):
+            return variant
+        if _missing_user_cache.get((api_url, variant), 0) <= now:
+            break
+    else:
+        return None  # every variant is known not to exist
     
-    variants = []
+    remaining = variants[i:]
+    existing = bulk_check_usernames(api_url, token, remaining)
+    return next((v for v in remaining if v in existing), None)
+
+def _parse_name(supervisor_name):
+    """Split a name into (firstname, lastname, firstname_alt, lastname_alt).
     
-    # Parse the name - handle multiple formats
-    if ',' in supervisor_name:
+    The *_alt parts hold the reversed interpretation for ambiguous
+    "A, B" names and are None otherwise.
+    """
+    # Alternate (reversed) interpretation, only set for ambiguous names
+    firstname_alt = None
+    lastname_alt = None
+    
+    # Parse the name - handle multiple formats. One regex pass splits off
+    # the (stripped) parts around the first comma, if there is one
+    part1, part2 = _NAME_RE.fullmatch(supervisor_name).group('a', 'b')
+    if part2 is not None:
         # Format with comma: could be "Lastname, Firstname" or "Firstname, Lastname"
-        parts = supervisor_name.split(',')
-        part1 = parts[0].strip()
-        part2 = parts[1].strip() if len(parts) > 1 else ""
-        
-        # Heuristic: If part1 looks like a firstname (common first names, or shorter),
-        # treat it as "Firstname, Lastname", otherwise "Lastname, Firstname"
-        # Common academic titles that suggest lastname comes first
-        academic_indicators = ['prof', 'dr', 'professor', 'doktor']
-        has_title = any(indicator in part1.lower() for indicator in academic_indicators)
-        
-        # Check if part2 contains spaces (suggesting it might be a compound lastname)
-        part2_has_spaces = ' ' in part2
-        
-        # If part1 is much longer than part2 and part2 doesn't have spaces,
-        # it's likely "Lastname, Firstname" (traditional academic format)
-        if (len(part1) > len(part2) * 1.5 and not part2_has_spaces) or has_title:
+        # Common academic titles suggest the lastname comes first
+        has_title = _TITLE_RE.search(part1) is not None
+        
+        # If part1 is much longer than part2 (more than 1.5x, compared in
+        # integers) and part2 doesn't have spaces (which would suggest a
+        # compound lastname), it's likely "Lastname, Firstname"
+        # (traditional academic format)
+        if (len(part1) * 2 > len(part2) * 3 and ' ' not in part2) or has_title:
             # Traditional format: "Lastname, Firstname"
             lastname = part1
             firstname = part2
         else:
-            # Could be reversed: "Firstname, Lastname"
-            # Try both interpretations
-            # First, assume it's reversed
-            firstname_option1 = part1
-            lastname_option1 = part2
-            # Second, assume it's traditional
-            firstname_option2 = part2
-            lastname_option2 = part1
-            
-            # We'll generate variants for both interpretations
-            # The traditional format is still more common, so we'll prioritize it
+            # Could be reversed: "Firstname, Lastname", so we generate
+            # variants for both interpretations. The traditional format is
+            # still more common, so we prioritize it
             firstname = part2  # traditional
             lastname = part1   # traditional
             firstname_alt = part1  # reversed
@@ -700,77 +1258,110 @@ def generate_username_variants(supervisor_name):
             # Assume last part is lastname, everything else is firstname
             firstname = ' '.join(parts[:-1])
             lastname = parts[-1]
-            firstname_alt = None
-            lastname_alt = None
         else:
             # Just one name, assume it's the lastname
             lastname = parts[0] if parts else supervisor_name.strip()
             firstname = ""
-            firstname_alt = None
-            lastname_alt = None
-    
-    # Remove umlauts and special characters
-    def normalize(text):
-        text = text.lower()
-        # Replace umlauts
-        replacements = {
-            'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss',
-            'á': 'a', 'é': 'e', 'í': 'i', 'ó': 'o', 'ú': 'u'
-        }
-        for old, new in replacements.items():
-            text = text.replace(old, new)
-        # Remove spaces and special characters except hyphens
-        text = re.sub(r'[^\w\-]', '', text)
-        return text
     
-    lastname_normalized = normalize(lastname)
-    firstname_normalized = normalize(firstname) if firstname else ""
+    return firstname, lastname, firstname_alt, lastname_alt
+
+def _primary_variant(name):
+    """Return only the most likely username variant for `name`.
     
-    # Pattern 1: first letter + lastname (most common for non-professors)
+    Same as generate_username_variants(name)[0], without building the
+    other variants.
+    """
+    firstname, lastname, _, _ = _parse_name(name)
+    lastname_normalized = _normalize_for_username(lastname)
+    firstname_normalized = _normalize_for_username(firstname) if firstname else ""
     if firstname_normalized:
-        variants.append(firstname_normalized[0] + lastname_normalized)
+        return firstname_normalized[0] + lastname_normalized
+    return lastname_normalized
+
+def generate_username_variants(supervisor_name):
+    """Generate possible Mattermost username variants from a supervisor name.
     
-    # Pattern 2: lastname only (for professors)
-    variants.append(lastname_normalized)
+    Args:
+        supervisor_name: Name in any format:
+            - "Lastname, Firstname" (standard academic format)
+            - "Firstname, Lastname" (reversed with comma)
+            - "Firstname Lastname" (natural order)
+            - "Lastname" (single name)
     
-    # Pattern 3: full firstname + lastname (rare but possible)
-    if firstname_normalized:
-        variants.append(firstname_normalized + lastname_normalized)
-    
-    # Pattern 4: With hyphenated names, try without hyphen
-    if '-' in lastname_normalized:
-        lastname_no_hyphen = lastname_normalized.replace('-', '')
-        if firstname_normalized:
-            variants.append(firstname_normalized[0] + lastname_no_hyphen)
-        variants.append(lastname_no_hyphen)
-    
-    # Pattern 5: If we have alternate interpretation (reversed format), try those too
-    if 'firstname_alt' in locals() and firstname_alt and lastname_alt:
-        lastname_alt_normalized = normalize(lastname_alt)
-        firstname_alt_normalized = normalize(firstname_alt) if firstname_alt else ""
-        
-        if firstname_alt_normalized:
-            variants.append(firstname_alt_normalized[0] + lastname_alt_normalized)
-        variants.append(lastname_alt_normalized)
-        if firstname_alt_normalized:
-            variants.append(firstname_alt_normalized + lastname_alt_normalized)
-        
-        # With hyphenated names (alt version)
-        if '-' in lastname_alt_normalized:
-            lastname_alt_no_hyphen = lastname_alt_normalized.replace('-', '')
-            if firstname_alt_normalized:
-                variants.append(firstname_alt_normalized[0] + lastname_alt_no_hyphen)
-            variants.append(lastname_alt_no_hyphen)
+    Returns:
+        List of username variants to try (in order of likelihood)
+    """
+    # Memoized per name; hand out a fresh list so callers may mutate it
+    return list(_generate_username_variants(supervisor_name))
+
+def _name_patterns(firstname, lastname):
+    """Return the username patterns for one normalized name reading.
     
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_variants = []
-    for v in variants:
-        if v not in seen:
-            seen.add(v)
-            unique_variants.append(v)
+    Most likely first: first letter + lastname (most common for
+    non-professors), lastname only (for professors), full firstname +
+    lastname (rare but possible), then the same without the hyphen for
+    hyphenated lastnames.
+    """
+    if firstname:
+        patterns = [firstname[0] + lastname, lastname, firstname + lastname]
+    else:
+        patterns = [lastname]
+    if '-' in lastname:
+        lastname_no_hyphen = lastname.replace('-', '')
+        if firstname:
+            patterns.append(firstname[0] + lastname_no_hyphen)
+        patterns.append(lastname_no_hyphen)
+    return patterns
+
+@functools.lru_cache(maxsize=512)
+def _generate_username_variants(supervisor_name):
+    """Build the variants for generate_username_variants() as a tuple."""
+    # A single plain word ("Schmidt") is just a lastname without a hyphen,
+    # so it has exactly one variant and needs no parsing
+    name = supervisor_name.strip()
+    if name.isalpha():
+        return (_normalize_for_username(name),)
+    
+    firstname, lastname, firstname_alt, lastname_alt = _parse_name(supervisor_name)
+    
+    lastname_normalized = _normalize_for_username(lastname)
+    firstname_normalized = _normalize_for_username(firstname) if firstname else ""
+    
+    # Patterns 1-4 for the primary reading
+    variants = _name_patterns(firstname_normalized, lastname_normalized)
     
-    return unique_variants
+    # Pattern 5: If we have alternate interpretation (reversed format), try those too.
+    # It is the primary reading swapped, so reuse the normalized parts
+    if firstname_alt and lastname_alt:
+        variants += _name_patterns(lastname_normalized, firstname_normalized)
+    
+    # Remove duplicates while preserving order
+    return tuple(dict.fromkeys(variants))
+
+# Manual override mapping (for special cases): a lastname containing the
+# key is mapped straight to the username. An exact lastname match wins;
+# otherwise the first key in this order that occurs in the lastname does
+# (so "Gaisdörfer-Hornung" maps to jhornung)
+MANUAL_OVERRIDES = {
+    'hornung': 'jhornung',
+    'gaisdörfer': 'mgais',
+    'gaisdorfer': 'mgais',
+    'gaisdoerfer': 'mgais',
+    'quiroga-trivino': 'aquiroga'
+}
+
+def _find_manual_override(supervisor):
+    """Return the override username for a "Lastname, Firstname" name, or None."""
+    lastname_lower = supervisor.partition(',')[0].strip().lower()
+    # Most overrides are keyed on the full lastname; only scan for a
+    # substring match when the direct lookup misses
+    override = MANUAL_OVERRIDES.get(lastname_lower)
+    if override is None:
+        override = next(
+            (u for key, u in MANUAL_OVERRIDES.items() if key in lastname_lower),
+            None
+        )
+    return override
 
 def extract_supervisor_usernames(supervisors, mattermost_config=None):
     """Extract Mattermost usernames from supervisor names with smart detection.
@@ -784,14 +1375,23 @@ def extract_supervisor_usernames(supervisors, mattermost_config=None):
     """
     usernames = []
     
-    # Manual override mapping (for special cases)
-    manual_overrides = {
-        'hornung': 'jhornung',
-        'gaisdörfer': 'mgais',
-        'gaisdorfer': 'mgais',
-        'gaisdoerfer': 'mgais',
-        'quiroga-trivino': 'aquiroga'
-    }
+    if mattermost_config:
+        # Check the variants of every supervisor that still needs a lookup
+        # with one bulk request; the per-supervisor probes below then only
+        # hit the caches
+        pending = [
+            variant
+            for supervisor in (s.strip() for s in supervisors)
+            if supervisor and supervisor not in _resolved_username_cache
+            and not _find_manual_override(supervisor)
+            for variant in generate_username_variants(supervisor)
+        ]
+        if pending:
+            bulk_check_usernames(
+                mattermost_config['api_url'],
+                mattermost_config['token'],
+                list(dict.fromkeys(pending))
+            )
     
     for supervisor in supervisors:
         supervisor = supervisor.strip()
@@ -801,47 +1401,46 @@ def extract_supervisor_usernames(supervisors, mattermost_config=None):
         print(f"  🔍 Processing supervisor: {supervisor}")
         
         # Check manual overrides first
-        lastname_lower = supervisor.lower().split(',')[0].strip()
-        found_override = False
-        for name_key, username in manual_overrides.items():
-            if name_key in lastname_lower:
-                print(f"    ✓ Using manual override: @{username}")
-                usernames.append(username)
-                found_override = True
-                break
+        username = _find_manual_override(supervisor)
+        if username:
+            print(f"    ✓ Using manual override: @{username}")
+            usernames.append(username)
+            continue
         
-        if found_override:
+        # Without Mattermost config, only the most likely variant is needed
+        if not mattermost_config:
+            username = _primary_variant(supervisor)
+            print(f"    → Using generated username: @{username}")
+            usernames.append(username)
+            continue
+        
+        # Names already resolved in this run skip the variant ladder
+        if supervisor in _resolved_username_cache:
+            username = _resolved_username_cache[supervisor]
+            print(f"    ✓ Found valid username: @{username} (cached)")
+            usernames.append(username)
             continue
         
         # Generate username variants
         variants = generate_username_variants(supervisor)
         print(f"    💡 Generated variants: {', '.join(variants)}")
         
-        # If Mattermost config is provided, test each variant
-        if mattermost_config:
-            found = False
-            for variant in variants:
-                if try_username_with_mattermost(
-                    mattermost_config['api_url'], 
-                    mattermost_config['token'], 
-                    variant
-                ):
-                    print(f"    ✓ Found valid username: @{variant}")
-                    usernames.append(variant)
-                    found = True
-                    break
-            
-            if not found:
-                error_msg = f"❌ ERROR: No valid Mattermost username found for '{supervisor}'"
-                print(f"    {error_msg}")
-                print(f"    Tried variants: {', '.join(variants)}")
-                print(f"    Please add a manual override in the script.")
-                raise ValueError(error_msg)
+        # Test each variant against Mattermost
+        variant = probe_variants(
+            mattermost_config['api_url'],
+            mattermost_config['token'],
+            variants
+        )
+        if variant:
+            print(f"    ✓ Found valid username: @{variant}")
+            usernames.append(variant)
+            _resolved_username_cache[supervisor] = variant
         else:
-            # Without Mattermost config, use first variant
-            username = variants[0]
-            print(f"    → Using generated username: @{username}")
-            usernames.append(username)
+            error_msg = f"❌ ERROR: No valid Mattermost username found for '{supervisor}'"
+            print(f"    {error_msg}")
+            print(f"    Tried variants: {', '.join(variants)}")
+            print(f"    Please add a manual override in the script.")
+            raise ValueError(error_msg)
     
     return usernames
 
@@ -860,29 +1459,38 @@ def extract_author_username(author_name, mattermost_config=None):
     
     print(f"  🔍 Processing author: {author_name}")
     
+    # Without Mattermost config, only the most likely variant is needed
+    if not mattermost_config:
+        username = _primary_variant(author_name)
+        print(f"    → Using generated username: @{username}")
+        return username
+    
+    if author_name in _resolved_username_cache:
+        username = _resolved_username_cache[author_name]
+        print(f"    ✓ Found valid username: @{username} (cached)")
+        return username
+    
     # Generate username variants
     variants = generate_username_variants(author_name)
     print(f"    💡 Generated variants: {', '.join(variants)}")
     
-    # If Mattermost config is provided, test each variant
-    if mattermost_config:
-        for variant in variants:
-            if try_username_with_mattermost(
-                mattermost_config['api_url'], 
-                mattermost_config['token'], 
-                variant
-            ):
-                print(f"    ✓ Found valid username: @{variant}")
-                return variant
-        
-        print(f"    ⚠️  No valid Mattermost username found for '{author_name}'")
-        print(f"    Tried variants: {', '.join(variants)}")
-        return None
-    else:
-        # Without Mattermost config, use first variant
-        username = variants[0]
-        print(f"    → Using generated username: @{username}")
-        return username
+    # Test each variant against Mattermost
+    variant = probe_variants(
+        mattermost_config['api_url'],
+        mattermost_config['token'],
+        variants
+    )
+    if variant:
+        print(f"    ✓ Found valid username: @{variant}")
+        _resolved_username_cache[author_name] = variant
+        return variant
+    
+    print(f"    ⚠️  No valid Mattermost username found for '{author_name}'")
+    print(f"    Tried variants: {', '.join(variants)}")
+    return None
+
+# Thesis types that get Mattermost notifications
+_THESIS_TYPE_RE = re.compile(r'bachelor|master', re.IGNORECASE)
 
 def send_mattermost_notifications(submissions, mattermost_config, interactive=False):
     """Send Mattermost notifications for pending submissions.
@@ -900,9 +1508,10 @@ def send_mattermost_notifications(submissions, mattermost_config, interactive=Fa
     
     # Load tracking data to check for already processed submissions
     tracking_data = load_processed_submissions()
+    processed = processed_keys(tracking_data)
     
-    # Test connection
-    success, bot_user = test_mattermost_connection(api_url, token)
+    # Test connection; a rejected token skips all Mattermost notifications
+    success, bot_user = get_bot_user(api_url, token)
     if not success:
         print("⚠ Skipping Mattermost notifications (connection failed)")
         return False
@@ -920,16 +1529,13 @@ def send_mattermost_notifications(submissions, mattermost_config, interactive=Fa
         print(f"\n--- Processing: {submission['title'][:50]}... ---")
         
         # Check if this submission has already been processed
-        if is_submission_processed(submission['record_id'], submission['author'], tracking_data):
+        key = (submission['record_id'], submission['author'])
+        if key in processed:
             print(f"⏭ Skipping - already processed (notifications already sent)")
             continue
         
-        # Check if this is a Bachelor Thesis
-        thesis_type = submission['thesis_type'].lower()
-        is_bachelor = 'bachelor' in thesis_type
-        is_master = 'master' in thesis_type
-        
-        if not (is_bachelor or is_master):
+        # Check if this is a Bachelor or Master thesis (one scan of the type)
+        if not _THESIS_TYPE_RE.search(submission['thesis_type']):
             print(f"⏭ Skipping Mattermost notification (not a Bachelor thesis or Master thesis: {submission['thesis_type']})")
             continue
         
@@ -953,27 +1559,30 @@ def send_mattermost_notifications(submissions, mattermost_config, interactive=Fa
                 print(f"    Email notification was still sent.\n")
                 continue
         
-        # Remove duplicates
-        recipients = list(set(recipients))
+        # Remove duplicates, keeping jhornung first (recipients[0] below relies on it)
+        recipients = list(dict.fromkeys(recipients))
         
         print(f"Recipients: {', '.join(recipients)}")
         
         # Format author name (convert "Last, First" to "First Last")
-        author_parts = submission['author'].split(',')
-        if len(author_parts) == 2:
-            author_display = f"{author_parts[1].strip()} {author_parts[0].strip()}"
+        author_lastname, comma, author_firstnames = submission['author'].partition(',')
+        is_last_first = bool(comma) and ',' not in author_firstnames
+        if is_last_first:
+            author_display = f"{author_firstnames.strip()} {author_lastname.strip()}"
         else:
             author_display = submission['author']
         
         # Format the message
-        message = f"Hi,\n{author_display} has submitted their thesis into publish.\n\n"
-        message += f"**Title**: {submission['title']}\n"
-        message += f"**Author**: {submission['author']}\n"
-        message += f"**Type**: {submission['thesis_type']}\n\n"
-        message += f"Can this be uploaded to publish with open access rights?\n"
-        message += f"If this isn't possible, please contact the author directly to clarify.\n"
-        message += f"Also, if some supervisors are missing from this notification, please inform @{recipients[0]}.\n\n"
-        message += f"Cheers,\nETPApprover Bot for the Webbadmin"
+        message = (
+            f"Hi,\n{author_display} has submitted their thesis into publish.\n\n"
+            f"**Title**: {submission['title']}\n"
+            f"**Author**: {submission['author']}\n"
+            f"**Type**: {submission['thesis_type']}\n\n"
+            "Can this be uploaded to publish with open access rights?\n"
+            "If this isn't possible, please contact the author directly to clarify.\n"
+            f"Also, if some supervisors are missing from this notification, please inform @{recipients[0]}.\n\n"
+            "Cheers,\nETPApprover Bot for the Webbadmin"
+        )
         
         # Interactive mode - show preview and ask for confirmation
         if interactive:
@@ -1018,24 +1627,25 @@ def send_mattermost_notifications(submissions, mattermost_config, interactive=Fa
             author_recipients = ['jhornung', author_username]
             
             # Remove duplicates (in case author is already jhornung)
-            author_recipients = list(set(author_recipients))
+            author_recipients = list(dict.fromkeys(author_recipients))
             
             # Extract first name for more personal greeting
-            author_parts = submission['author'].split(',')
-            if len(author_parts) == 2:
+            if is_last_first:
                 # Format is "Lastname, Firstname" - use firstname
-                author_firstname = author_parts[1].strip().split()[0]  # Get first part of firstname
+                author_firstname = author_firstnames.split()[0]  # Get first part of firstname
             else:
                 # Fallback to full display name
                 author_firstname = author_display.split()[0]
             
             # Format author's permission request message
-            author_message = f"Hi {author_firstname},\n\n"
-            author_message += f"Your thesis **\"{submission['title']}\"** has been submitted to our repository. Congratulations for handing in :partyparrot:\n\n"
-            author_message += f"We would like to confirm: Do you give permission to publish this thesis with **open access rights**? "
-            author_message += f"This means your thesis will be publicly accessible online.\n\n"
-            author_message += f"Please reply with your confirmation.\n\n"
-            author_message += f"Cheers,\nETPApprover Bot for the Webbadmin"
+            author_message = (
+                f"Hi {author_firstname},\n\n"
+                f"Your thesis **\"{submission['title']}\"** has been submitted to our repository. Congratulations for handing in :partyparrot:\n\n"
+                "We would like to confirm: Do you give permission to publish this thesis with **open access rights**? "
+                "This means your thesis will be publicly accessible online.\n\n"
+                "Please reply with your confirmation.\n\n"
+                "Cheers,\nETPApprover Bot for the Webbadmin"
+            )
             
             print(f"Author recipients: {', '.join(author_recipients)}")
             
@@ -1086,6 +1696,7 @@ def send_mattermost_notifications(submissions, mattermost_config, interactive=Fa
             submission['title'],
             tracking_data
         )
+        processed.add(key)
         save_processed_submissions(tracking_data)
     
     return True
@@ -1097,12 +1708,23 @@ def run_scraper(capture_log=False, interactive=False):
         capture_log: If True, capture all output and attach to email
         interactive: If True, ask for confirmation before sending each notification
     """
-    # Set up log capturing if requested
-    tee = None
-    if capture_log:
-        tee = TeeOutput()
-        sys.stdout = tee
-        sys.stderr = tee
+    if not capture_log:
+        return _run_scraper(None, interactive)
+    
+    # Capture output only for the duration of the run
+    with TeeOutput() as tee:
+        return _run_scraper(tee, interactive)
+
+def _run_scraper(tee, interactive):
+    """Scraper body; `tee` is the active TeeOutput or None."""
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+    
+    smtp_config = SMTP_CONFIG
+    
+    # Each run starts from fresh in-memory lookups (users found within the
+    # last _PERSISTENT_USER_TTL seconds are still served from disk)
+    clear_username_caches()
     
     try:
         start_time = datetime.now()
@@ -1120,7 +1742,7 @@ def run_scraper(capture_log=False, interactive=False):
         creds = load_credentials()
         
         # Login to repository
-        session = login(login_url, creds['email'], creds['password'])
+        session = login(login_url, creds['email'], creds['password'], api_url)
         if not session:
             print("\n✗ Login failed, exiting")
             sys.exit(1)
@@ -1147,14 +1769,6 @@ def run_scraper(capture_log=False, interactive=False):
             log_content = tee.getvalue() if tee else None
             
             # Send email notification with complete log
-            smtp_config = {
-                'smtp_server': 'localhost',
-                'smtp_port': 25,
-                'from_email': 'etp-admin@lists.kit.edu',
-                'to_email': 'webadmin@etp.kit.edu',
-                'use_tls': False
-            }
-            
             # In interactive mode, ask about email
             if interactive:
                 print("\n" + "=" * 60)
@@ -1186,34 +1800,19 @@ def run_scraper(capture_log=False, interactive=False):
         print(f"{'='*60}")
         
         # Send status email with log if there were no submissions
-        if not results and capture_log:
-            log_content = tee.getvalue() if tee else None
+        if not results and tee:
+            log_content = tee.getvalue()
             if log_content:
-                smtp_config = {
-                    'smtp_server': 'localhost',
-                    'smtp_port': 25,
-                    'from_email': 'etp-admin@lists.kit.edu',
-                    'to_email': 'webadmin@etp.kit.edu',
-                    'use_tls': False
-                }
                 # Send a simple status email
                 msg = MIMEMultipart()
                 msg['From'] = smtp_config.get('from_email')
                 msg['To'] = smtp_config.get('to_email')
                 msg['Subject'] = 'ETaPprover - No Pending Submissions'
                 msg.attach(MIMEText('No pending thesis submissions found.\n\nSee attached log for details.', 'plain'))
-                
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                log_filename = f"etapprover_log_{timestamp}.txt"
-                attachment = MIMEBase('application', 'octet-stream')
-                attachment.set_payload(log_content.encode('utf-8'))
-                encoders.encode_base64(attachment)
-                attachment.add_header('Content-Disposition', f'attachment; filename={log_filename}')
-                msg.attach(attachment)
+                _attach_log(msg, log_content)
                 
                 try:
-                    with smtplib.SMTP(smtp_config['smtp_server'], smtp_config['smtp_port']) as server:
-                        server.send_message(msg)
+                    _send_email(msg, smtp_config)
                     print("✓ Status email with log sent")
                 except Exception as e:
                     print(f"✗ Failed to send status email: {e}")
@@ -1231,15 +1830,8 @@ def run_scraper(capture_log=False, interactive=False):
         print(f"{'='*60}")
         
         # Send error email with log if we're capturing logs
-        if capture_log and tee:
+        if tee:
             log_content = tee.getvalue()
-            smtp_config = {
-                'smtp_server': 'localhost',
-                'smtp_port': 25,
-                'from_email': 'etp-admin@lists.kit.edu',
-                'to_email': 'webadmin@etp.kit.edu',
-                'use_tls': False
-            }
             
             msg = MIMEMultipart()
             msg['From'] = smtp_config.get('from_email')
@@ -1249,29 +1841,15 @@ def run_scraper(capture_log=False, interactive=False):
             body = f"An error occurred while running ETaPprover:\n\n{error_msg}\n\n"
             body += "See attached log file for complete details."
             msg.attach(MIMEText(body, 'plain'))
-            
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            log_filename = f"etapprover_error_log_{timestamp}.txt"
-            attachment = MIMEBase('application', 'octet-stream')
-            attachment.set_payload(log_content.encode('utf-8'))
-            encoders.encode_base64(attachment)
-            attachment.add_header('Content-Disposition', f'attachment; filename={log_filename}')
-            msg.attach(attachment)
+            _attach_log(msg, log_content, prefix='etapprover_error_log')
             
             try:
-                with smtplib.SMTP(smtp_config['smtp_server'], smtp_config['smtp_port']) as server:
-                    server.send_message(msg)
+                _send_email(msg, smtp_config)
                 print("✓ Error notification email sent with log attached")
             except Exception as email_error:
                 print(f"✗ Failed to send error email: {email_error}")
         
         raise  # Re-raise the exception after logging
-        
-    finally:
-        # Restore original stdout/stderr
-        if tee:
-            sys.stdout = tee.terminal
-            sys.stderr = tee.terminal
 
 def run_mattermost_test():
     """Interactive Mattermost messaging test."""
@@ -1298,163 +1876,13 @@ def run_mattermost_test():
     print(f"  API URL: {api_url}")
     
     # Interactive messaging
-    print("\n" + "=" * 60)
-    
-    while True:
-        print("\n📨 Mattermost Test Menu")
-        print("Options:")
-        print("  1. Send to one person")
-        print("  2. Send to multiple people (individual DMs)")
-        print("  3. Send to group DM (all people in same conversation)")
-        print("  4. Test username lookup")
-        print("  5. Quit")
-        
-        choice = input("Choose option (1/2/3/4/5): ").strip()
-        
-        if choice == '5' or choice.lower() in ['quit', 'exit', 'q']:
-            break
-        
-        if choice not in ['1', '2', '3', '4']:
-            print("Please choose 1, 2, 3, 4, or 5.")
-            continue
-        
-        # Username lookup tool
-        if choice == '4':
-            print("\n" + "=" * 60)
-            print("🔍 Username Lookup Tool")
-            print("=" * 60)
-            print("Enter supervisor name(s) in format 'Lastname, Firstname'")
-            print("(one per line, press Enter twice when done):")
-            
-            names = []
-            empty_lines = 0
-            
-            while empty_lines < 2:
-                name = input().strip()
-                if name == "":
-                    empty_lines += 1
-                else:
-                    empty_lines = 0
-                    names.append(name)
-            
-            if not names:
-                print("No names entered.")
-                continue
-            
-            print("\n" + "-" * 60)
-            print("📊 Username Lookup Results:")
-            print("-" * 60)
-            
-            mattermost_config = {
-                'api_url': api_url,
-                'token': token
-            }
-            
-            usernames = extract_supervisor_usernames(names, mattermost_config)
-            
-            print("\n✓ Generated username mapping:")
-            for i, name in enumerate(names):
-                if i < len(usernames):
-                    print(f"  {name} → @{usernames[i]}")
-            
-            print("-" * 60)
-            continue
-        
-        # Get target username(s)
-        if choice == '1':
-            target_username = input("Enter target username: ").strip()
-            if not target_username:
-                print("Please enter a valid username.")
-                continue
-            usernames = [target_username]
-        else:  # choice == '2' or '3'
-            if choice == '2':
-                print("Enter usernames for individual DMs (one per line, press Enter twice when done):")
-            else:  # choice == '3'
-                print("Enter usernames for group DM (one per line, press Enter twice when done):")
-            
-            usernames = []
-            empty_lines = 0
-            
-            while empty_lines < 2:
-                username = input().strip()
-                if username == "":
-                    empty_lines += 1
-                else:
-                    empty_lines = 0
-                    usernames.append(username)
-            
-            if not usernames:
-                print("Please enter at least one username.")
-                continue
-            
-            if choice == '3' and len(usernames) < 2:
-                print("Group DMs require at least 2 participants.")
-                continue
-            
-            print(f"Target users: {', '.join(usernames)}")
-        
-        # Get message
-        print("\nEnter your message (press Enter twice to finish):")
-        message_lines = []
-        empty_lines = 0
-        
-        while empty_lines < 2:
-            line = input()
-            if line == "":
-                empty_lines += 1
-            else:
-                empty_lines = 0
-            message_lines.append(line)
-        
-        # Remove trailing empty lines
-        while message_lines and message_lines[-1] == "":
-            message_lines.pop()
-        
-        message = "\n".join(message_lines)
-        
-        if not message.strip():
-            print("Message cannot be empty. Try again.")
-            continue
-        
-        # Show preview and confirm
-        print("\n" + "-" * 30)
-        print("MESSAGE PREVIEW:")
-        print("-" * 30)
-        print(message)
-        print("-" * 30)
-        
-        # Show confirmation
-        if choice == '1':
-            confirm_msg = f"\nSend this message to @{usernames[0]}? (y/n): "
-        elif choice == '2':
-            confirm_msg = f"\nSend individual DMs to {len(usernames)} users ({', '.join(usernames)})? (y/n): "
-        else:  # choice == '3'
-            confirm_msg = f"\nSend this message to group DM with {len(usernames)} users ({', '.join(usernames)})? (y/n): "
-        
-        confirm = input(confirm_msg).strip().lower()
-        
-        if confirm in ['y', 'yes']:
-            print("\n" + "=" * 60)
-            
-            if choice == '1':
-                success = send_dm_to_user(api_url, token, bot_id, usernames[0], message)
-                if success:
-                    print(f"✅ Message delivered to @{usernames[0]}!")
-                else:
-                    print(f"❌ Failed to deliver message to @{usernames[0]}")
-            elif choice == '2':
-                results = send_dm_to_multiple_users(api_url, token, bot_id, usernames, message)
-                successful_count = sum(1 for success in results.values() if success)
-                print(f"\n🎯 Individual DMs complete: {successful_count}/{len(usernames)} successful")
-            else:  # choice == '3'
-                success = send_group_dm(api_url, token, bot_id, usernames, message)
-                if success:
-                    print(f"✅ Group DM message sent to {len(usernames)} participants!")
-                else:
-                    print(f"❌ Failed to send group DM message")
-        else:
-            print("Message cancelled.")
+    run_dm_shell(
+        api_url, token, bot_id,
+        send_dm_to_user=send_dm_to_user,
+        send_group_dm=send_group_dm,
+        send_dm_to_multiple_users=send_dm_to_multiple_users,
+        username_lookup=extract_supervisor_usernames
+    )
     
     print("\n👋 Goodbye!")
 
@@ -1498,6 +1926,18 @@ Examples:
         help='Ask for confirmation before sending each notification (for testing)'
     )
     
+    parser.add_argument(
+        '--verbose',
+        action='store_true',
+        help='Also show per-request Mattermost progress messages'
+    )
+    
+    parser.add_argument(
+        '--quiet',
+        action='store_true',
+        help='Only show Mattermost warnings and errors'
+    )
+    
     parser.add_argument(
         '--dry-run',
         action='store_true',
@@ -1506,6 +1946,11 @@ Examples:
     
     args = parser.parse_args()
     
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
+    elif args.quiet:
+        logger.setLevel(logging.WARNING)
+    
     # Dry-run implies interactive
     if args.dry_run:
         args.interactive = True
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Processed-submission tracking shared by scrape.py and the maintenance scripts
+"""
+import os
+import json
+import tempfile
+from datetime import datetime
+
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_TRACKING_FILE = os.path.join(_SCRIPT_DIR, 'processed_submissions.json')
+
+# Every tracking entry carries these keys after loading
+_ENTRY_DEFAULTS = {'record_id': None, 'author': None, 'title': None, 'processed_at': ''}
+
+def _normalize_entry(entry):
+    """Fill keys missing from a legacy or hand-edited tracking entry."""
+    return {**_ENTRY_DEFAULTS, **entry}
+
+def load_processed_submissions():
+    """Load the list of already processed submissions.
+    
+    Entries are upgraded on load (see _normalize_entry), so callers can
+    index their keys directly.
+    """
+    try:
+        with open(_TRACKING_FILE, 'rb') as f:
+            tracking_data = json.loads(f.read())
+    except (ValueError, FileNotFoundError):
+        return {"processed": []}
+    
+    tracking_data['processed'] = [
+        _normalize_entry(entry)
+        for entry in tracking_data.get('processed', [])
+        if isinstance(entry, dict)
+    ]
+    return tracking_data
+
+def save_processed_submissions(tracking_data):
+    """Save the list of processed submissions."""
+    tmp_file = None
+    try:
+        # Serialize compactly in memory and write once (json.dump issues one
+        # write per token); use `manage_tracking.py --pretty` to read it
+        payload = json.dumps(tracking_data, separators=(',', ':'), ensure_ascii=False)
+        # Write to a unique temp file and swap it in so a crash never leaves
+        # half a file and concurrent runs never clobber each other's temp
+        fd, tmp_file = tempfile.mkstemp(
+            dir=_SCRIPT_DIR, prefix='processed_submissions.', suffix='.tmp'
+        )
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_file, _TRACKING_FILE)
+    except Exception as e:
+        print(f"⚠️  Warning: Could not save tracking data: {e}")
+        if tmp_file and os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+def processed_keys(tracking_data):
+    """Return the (record_id, author) pairs of all processed submissions.
+    
+    Build this once per run and test membership against it instead of
+    scanning the tracking list for every submission.
+    """
+    # load_processed_submissions() fills in missing keys, so plain
+    # indexing is safe
+    return {(e['record_id'], e['author']) for e in tracking_data.get('processed', [])}
+
+def mark_submission_processed(record_id, author, title, tracking_data):
+    """Mark a submission as processed."""
+    entry = {
+        'record_id': record_id,
+        'author': author,
+        'title': title,
+        'processed_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+    
+    if 'processed' not in tracking_data:
+        tracking_data['processed'] = []
+    
+    tracking_data['processed'].append(entry)
+    return tracking_data